@@ -0,0 +1,3 @@
+from .core import load_df, build_layout, register_callbacks
+
+__all__ = ["load_df", "build_layout", "register_callbacks"]
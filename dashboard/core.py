@@ -0,0 +1,486 @@
+"""Lógica compartida del dashboard de causa raíz: carga, layout y callbacks."""
+import hashlib
+import logging
+import os
+import re
+from functools import lru_cache
+
+from dash import html, dcc, dash_table, Input, Output, State
+import pandas as pd
+import numpy as np
+import dash_bootstrap_components as dbc
+from flask_caching import Cache
+import plotly.graph_objects as go
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv as pacsv
+import pyarrow.parquet as pq
+
+log = logging.getLogger(__name__)
+
+# ================== Carga robusta de datos ================== #
+# Solo se leen las columnas que usa el dashboard; Arrow parsea las fechas
+# y deja los textos como diccionario (category en pandas).
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CSV = os.path.join(BASE, "causas_raiz.csv")
+PARQUET = os.path.join(BASE, "causas_raiz.parquet")
+COLUMNAS = ["Fecha", "Equipo", "Falla", "Causa", "Categoria", "Frecuencia"]
+TEXTO = pa.dictionary(pa.int32(), pa.string())
+TIPOS = {
+    "Fecha": pa.timestamp("ns"),
+    "Equipo": TEXTO,
+    "Falla": TEXTO,
+    "Causa": TEXTO,
+    "Categoria": TEXTO,
+    "Frecuencia": pa.int32(),
+}
+ESQUEMA = pa.schema([(col, TIPOS[col]) for col in COLUMNAS])
+# Los mismos tipos para el lector de pandas (Int32 admite celdas vacías)
+DTYPES = {
+    "Equipo": "category",
+    "Falla": "category",
+    "Causa": "category",
+    "Categoria": "category",
+    "Frecuencia": "Int32",
+}
+# Valor para celdas vacías, del mismo tipo que cada columna; Fecha queda NaT
+RELLENOS = {
+    "Equipo": "Sin datos",
+    "Falla": "Sin datos",
+    "Causa": "Sin datos",
+    "Categoria": "Sin datos",
+    "Frecuencia": 0,
+}
+# Huella de cómo se arma el Parquet: si cambian los tipos, los rellenos o
+# FORMATO (subirlo al cambiar la lectura), el archivo cacheado se regenera
+FORMATO = 1
+VERSION_CACHE = hashlib.sha256(
+    repr((FORMATO, ESQUEMA.to_string(), sorted(RELLENOS.items()))).encode()
+).hexdigest()[:16]
+
+
+def leer_csv():
+    """Lee el CSV ya tipado; si Arrow lo rechaza por mal formado, usa pandas."""
+    try:
+        return pacsv.read_csv(
+            CSV,
+            read_options=pacsv.ReadOptions(use_threads=True),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=COLUMNAS,
+                # Una columna ausente (ej. Fecha) llega como nulos de su tipo,
+                # sin inventar valores fila por fila
+                include_missing_columns=True,
+                strings_can_be_null=True,
+                column_types=TIPOS,
+            ),
+        )
+    except pa.ArrowInvalid as error:
+        log.warning("CSV irregular, se lee con pandas: %s", error)
+
+    # Mismas columnas y tipos en una sola pasada, tolerando filas irregulares.
+    # Se mira la cabecera antes: parse_dates falla si Fecha no existe.
+    cabecera = pd.read_csv(CSV, nrows=0).columns
+    tipos = {col: tipo for col, tipo in DTYPES.items() if col != "Frecuencia"}
+    df = pd.read_csv(
+        CSV,
+        usecols=lambda col: col in COLUMNAS,
+        dtype=tipos,
+        parse_dates=["Fecha"] if "Fecha" in cabecera else None,
+        on_bad_lines="skip",
+    )
+    # Fechas o frecuencias ilegibles quedan vacías en vez de romper la carga
+    if "Fecha" in df.columns and not pd.api.types.is_datetime64_dtype(df["Fecha"]):
+        df["Fecha"] = pd.to_datetime(df["Fecha"], errors="coerce")
+    if "Frecuencia" in df.columns:
+        frecuencia = pd.to_numeric(df["Frecuencia"], errors="coerce")
+        df["Frecuencia"] = frecuencia.where(frecuencia % 1 == 0).astype(DTYPES["Frecuencia"])
+    # Las columnas ausentes se agregan como nulos de su tipo, igual que en la
+    # vía Arrow; el esquema final no lleva metadatos de pandas
+    presentes = [col for col in COLUMNAS if col in df.columns]
+    tabla = pa.Table.from_pandas(df[presentes], preserve_index=False,
+                                 schema=pa.schema([(col, TIPOS[col]) for col in presentes]))
+    columnas = [tabla[col] if col in presentes else pa.nulls(tabla.num_rows, TIPOS[col])
+                for col in COLUMNAS]
+    return pa.Table.from_arrays(columnas, schema=ESQUEMA)
+
+
+def parquet_vigente():
+    """True si el Parquet existe, es más nuevo que el CSV y tiene la versión actual."""
+    if not os.path.exists(PARQUET) or os.path.getmtime(PARQUET) < os.path.getmtime(CSV):
+        return False
+    metadatos = pq.read_schema(PARQUET).metadata or {}
+    return metadatos.get(b"acr_version") == VERSION_CACHE.encode()
+
+
+def ensure_parquet():
+    """Regenera el Parquet desde el CSV si no existe o quedó desactualizado.
+
+    Si el Parquet no se puede escribir (ej. checkout de solo lectura) devuelve
+    la tabla ya leída para usarla en memoria; en otro caso devuelve None.
+    """
+    if parquet_vigente():
+        log.debug("Parquet al día: %s", PARQUET)
+        return None
+
+    log.debug("Regenerando %s desde %s", PARQUET, CSV)
+    tabla = leer_csv()
+    for col, valor in RELLENOS.items():
+        tabla = tabla.set_column(tabla.schema.get_field_index(col), col,
+                                 pc.fill_null(tabla[col], valor))
+
+    # Se escribe a un temporal y se renombra para que otro worker nunca lea
+    # un archivo a medio escribir
+    temporal = f"{PARQUET}.{os.getpid()}.tmp"
+    tabla = tabla.replace_schema_metadata({"acr_version": VERSION_CACHE})
+    try:
+        pq.write_table(tabla, temporal, compression="zstd")
+        os.replace(temporal, PARQUET)
+    except OSError as error:
+        log.warning("No se pudo escribir %s, se usan los datos en memoria: %s",
+                    PARQUET, error)
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        return tabla
+    return None
+
+
+@lru_cache(maxsize=1)
+def load_df():
+    """Carga el DataFrame una sola vez; las siguientes llamadas lo reutilizan."""
+    tabla = ensure_parquet()
+    if tabla is not None:
+        df = tabla.to_pandas()
+    else:
+        df = pd.read_parquet(PARQUET, engine="pyarrow", memory_map=True)
+    log.debug("Datos cargados: %d filas, columnas %s", len(df.index), df.columns.tolist())
+    return df
+
+
+# ================== Agregados precalculados ================== #
+# Se agrupa una sola vez por (Equipo, Categoria); después solo se recortan
+# estos grupos en vez de recorrer todas las filas.
+def crear_agregados(df):
+    """Devuelve (agregados, combinaciones observadas de Equipo y Categoria)."""
+    causa_agg = df.groupby(["Equipo", "Categoria", "Causa"], observed=True)["Frecuencia"].sum()
+    cat_agg = df.groupby(["Equipo", "Categoria"], observed=True)["Falla"].count()
+
+    def agregados(equipo, categoria):
+        """Devuelve (pareto, conteo por categoría) para un par de filtros."""
+        causas, categorias = causa_agg, cat_agg
+        if equipo:
+            causas = causas[causas.index.get_level_values("Equipo") == equipo]
+            categorias = categorias[categorias.index.get_level_values("Equipo") == equipo]
+        if categoria:
+            causas = causas[causas.index.get_level_values("Categoria") == categoria]
+            categorias = categorias[categorias.index.get_level_values("Categoria") == categoria]
+
+        pareto = causas.groupby(level="Causa", observed=True).sum().sort_values(ascending=False)
+        categoria_count = categorias.groupby(level="Categoria", observed=True).sum()
+        return pareto, categoria_count
+
+    return agregados, cat_agg.index
+
+
+# Colores consistentes
+color_map = {
+    "Causa Física": "#636EFA",     # azul
+    "Causa Técnica": "#EF553B",    # rojo
+    "Causa Operativa": "#00CC96"   # verde
+}
+
+
+# ================== Figuras ================== #
+def crear_figuras(pareto, categoria_count):
+    """Construye las figuras completas; solo se usa para el layout inicial."""
+    # Pareto
+    fig_pareto = go.Figure(go.Bar(
+        x=pareto.index.to_numpy(),
+        y=pareto.to_numpy(),
+        hovertemplate="Causa=%{x}<br>Frecuencia=%{y}<extra></extra>",
+    ))
+    fig_pareto.update_layout(title="Pareto de Causas",
+                             xaxis_title="Causa", yaxis_title="Frecuencia")
+
+    # Categorías (torta)
+    fig_torta = go.Figure(go.Pie(
+        labels=categoria_count.index.to_numpy(),
+        values=categoria_count.to_numpy(),
+        hole=0.3,
+        marker=dict(colors=[color_map.get(cat) for cat in categoria_count.index]),
+        textinfo="percent+label+value",
+        hovertemplate="Categoria=%{label}<br>Cantidad=%{value}<extra></extra>",
+    ))
+
+    return fig_pareto, fig_torta
+
+
+# ================== Series para el navegador ================== #
+# Todas las combinaciones de filtros se precalculan y viajan una sola vez en
+# un dcc.Store; al cambiar un filtro el navegador solo reemplaza los arrays
+# de cada traza y Plotly.react redibuja lo que cambió.
+def serie_figuras(pareto, categoria_count):
+    return {
+        "causa_x": pareto.index.tolist(),
+        "causa_y": pareto.tolist(),
+        "cat_labels": categoria_count.index.tolist(),
+        "cat_values": categoria_count.tolist(),
+        "cat_colors": [color_map.get(cat) for cat in categoria_count.index],
+    }
+
+
+def calcular_series(agregados, combinaciones):
+    claves = {("", "")}
+    for eq, cat in combinaciones:
+        claves.update({(eq, cat), (eq, ""), ("", cat)})
+    return {f"{eq}||{cat}": serie_figuras(*agregados(eq or None, cat or None)) for eq, cat in claves}
+
+
+# ================== Opciones de filtros ================== #
+def opciones(columna):
+    """Opciones de un dropdown, leídas de las categorías (sin recorrer filas)."""
+    return [{"label": valor, "value": valor} for valor in columna.cat.categories.tolist()]
+
+
+# ================== Tabla ================== #
+# '{col} operador valor': el operador va justo después de la columna, así un
+# valor como "ge " nunca se confunde con un operador
+PATRON_FILTRO = re.compile(
+    r"^\s*\{(?P<col>[^}]*)\}\s*(?P<op>is blank|is nil|[a-z]+|[<>!]?=|[<>])\s*(?P<valor>.*?)\s*$"
+)
+SIMBOLOS = {"=": "eq", "!=": "ne", "<": "lt", "<=": "le", ">": "gt", ">=": "ge"}
+COMPARACIONES = ("eq", "ne", "lt", "le", "gt", "ge")
+
+
+def separar_filtro(parte):
+    """Convierte '{col} op valor' del filter_query en (col, op, valor)."""
+    coincidencia = PATRON_FILTRO.match(parte)
+    if not coincidencia:
+        return None, None, None
+    col, operador, valor = coincidencia.group("col", "op", "valor")
+    operador = SIMBOLOS.get(operador, operador)
+
+    if valor and valor[0] == valor[-1] and valor[0] in ("'", '"', "`") and len(valor) > 1:
+        valor = valor[1:-1].replace("\\" + valor[0], valor[0])
+    elif operador in COMPARACIONES:
+        # Solo las comparaciones usan el número; contains busca el texto tal cual
+        try:
+            valor = float(valor)
+        except ValueError:
+            pass
+    return col, operador, valor
+
+
+def como_texto(columna):
+    # Las categorías se comparan/ordenan como texto, no por su código
+    if isinstance(columna.dtype, pd.CategoricalDtype):
+        return columna.astype(str)
+    return columna
+
+
+def filtrar_tabla(dff, filter_query):
+    for parte in (filter_query or "").split(" && "):
+        if not parte.strip():
+            continue
+        col, operador, valor = separar_filtro(parte)
+        if col not in dff.columns:
+            continue
+        columna = como_texto(dff[col])
+        if operador in COMPARACIONES:
+            try:
+                dff = dff[getattr(columna, operador)(valor)]
+            except TypeError:
+                # Valor no comparable con la columna (ej. texto vs número)
+                dff = dff.iloc[0:0]
+        elif operador in ("contains", "scontains"):
+            dff = dff[columna.astype(str).str.contains(valor, regex=False)]
+        elif operador == "icontains":
+            dff = dff[columna.astype(str).str.contains(valor, case=False, regex=False)]
+        elif operador == "datestartswith":
+            dff = dff[columna.astype(str).str.startswith(valor)]
+        elif operador in ("is blank", "is nil"):
+            dff = dff[columna.isna() | (columna.astype(str).str.strip() == "")]
+        else:
+            # Operador que la tabla no sabe aplicar: mejor ninguna fila que
+            # ignorar el filtro en silencio
+            log.debug("Operador de filtro no soportado: %r", parte)
+            dff = dff.iloc[0:0]
+    return dff
+
+
+def paginar_tabla(df, equipo, categoria, page_current, page_size, orden,
+                  filter_query, columnas=None):
+    """Filtra, ordena y recorta una página; devuelve (filas, page_count, page_current)."""
+    columnas = columnas or df.columns.tolist()
+
+    # Filtros: una sola máscara combinada (sobre códigos de categoría)
+    condiciones = []
+    if equipo:
+        condiciones.append(df["Equipo"].values == equipo)
+    if categoria:
+        condiciones.append(df["Categoria"].values == categoria)
+    dff = df[np.logical_and.reduce(condiciones)] if condiciones else df
+    dff = filtrar_tabla(dff, filter_query)
+
+    if orden:
+        dff = dff.sort_values(
+            [col for col, _ in orden],
+            ascending=[direccion == "asc" for _, direccion in orden],
+            key=como_texto,
+        )
+
+    # Si el filtro deja menos páginas, se vuelve a la última disponible
+    page_count = max(1, -(-len(dff.index) // page_size))
+    page_current = min(page_current, page_count - 1)
+    inicio = page_current * page_size
+    pagina = dff.iloc[inicio:inicio + page_size]
+    # Solo se empaquetan las filas visibles, sin pasar por to_dict("records")
+    filas = [dict(zip(columnas, fila)) for fila in pagina.itertuples(index=False, name=None)]
+    return filas, page_count, page_current
+
+
+# ================== Layout ================== #
+def build_layout(df):
+    agregados, combinaciones = crear_agregados(df)
+    fig_pareto_inicial, fig_torta_inicial = crear_figuras(*agregados(None, None))
+    series = calcular_series(agregados, combinaciones)
+
+    return html.Div([
+        # Sidebar
+        html.Div([
+            html.H2("⚙️ Filtros", className="text-center mb-4"),
+
+            dbc.Label("Selecciona un equipo:"),
+            dcc.Dropdown(
+                id="filtro-equipo",
+                options=opciones(df["Equipo"]),
+                value=None,
+                placeholder="Filtrar por equipo...",
+                clearable=True,
+                className="mb-3"
+            ),
+
+            dbc.Label("Selecciona una categoría:"),
+            dcc.Dropdown(
+                id="filtro-categoria",
+                options=opciones(df["Categoria"]),
+                value=None,
+                placeholder="Filtrar por categoría...",
+                clearable=True
+            )
+
+        ], style={
+            "width": "20%",
+            "padding": "20px",
+            "backgroundColor": "#f8f9fa",
+            "position": "fixed",
+            "top": 0,
+            "left": 0,
+            "bottom": 0,
+            "overflowY": "auto"
+        }),
+
+        # Main Content
+        html.Div([
+            html.H1("📊 Dashboard de Causa Raíz",
+                    className="text-center my-4",
+                    style={"color": "#2c3e50"}),
+
+            dbc.Row([
+                dbc.Col(dbc.Card([
+                    dbc.CardHeader("Pareto de Causas"),
+                    dbc.CardBody(dcc.Graph(id="pareto", figure=fig_pareto_inicial))
+                ], className="shadow-sm mb-4"), md=6),
+
+                dbc.Col(dbc.Card([
+                    dbc.CardHeader("Distribución de Categorías"),
+                    dbc.CardBody(dcc.Graph(id="categorias_torta", figure=fig_torta_inicial))
+                ], className="shadow-sm mb-4"), md=6),
+            ]),
+
+            html.H3("📋 Tabla de Datos", className="text-center mt-4"),
+            dash_table.DataTable(
+                id="tabla-datos",
+                columns=[{"name": i, "id": i} for i in df.columns],
+                data=[],
+                page_current=0,
+                page_size=10,
+                page_action="custom",
+                sort_action="custom",
+                sort_mode="multi",
+                sort_by=[],
+                filter_action="custom",
+                filter_query="",
+                style_table={"overflowX": "auto"},
+                style_cell={"textAlign": "center", "padding": "5px"},
+                style_header={"backgroundColor": "#e9ecef", "fontWeight": "bold"}
+            ),
+
+            dcc.Store(id="series", data=series)
+        ], style={"marginLeft": "22%", "padding": "20px"})
+    ])
+
+
+# ================== Callbacks ================== #
+def register_callbacks(app, df):
+    # Las combinaciones de filtros se repiten mucho: cada página calculada se
+    # guarda una hora en memoria del proceso
+    cache = Cache(app.server, config={"CACHE_TYPE": "SimpleCache", "CACHE_DEFAULT_TIMEOUT": 3600})
+
+    # Lista de columnas fija que cada página reutiliza
+    columnas = df.columns.tolist()
+
+    # Se ejecuta en el navegador: toma la serie precalculada y reemplaza solo
+    # x/y de la barra y labels/values/colores de la torta.
+    app.clientside_callback(
+        """
+        function(equipo, categoria, series, pareto, torta) {
+            const vacio = {causa_x: [], causa_y: [], cat_labels: [], cat_values: [], cat_colors: []};
+            const s = series[(equipo || "") + "||" + (categoria || "")] || vacio;
+
+            const barras = Object.assign({}, pareto.data[0], {x: s.causa_x, y: s.causa_y});
+            const sectores = Object.assign({}, torta.data[0], {
+                labels: s.cat_labels,
+                values: s.cat_values,
+                marker: Object.assign({}, torta.data[0].marker, {colors: s.cat_colors})
+            });
+
+            return [
+                Object.assign({}, pareto, {data: [barras]}),
+                Object.assign({}, torta, {data: [sectores]})
+            ];
+        }
+        """,
+        [Output("pareto", "figure"),
+         Output("categorias_torta", "figure")],
+        [Input("filtro-equipo", "value"),
+         Input("filtro-categoria", "value")],
+        [State("series", "data"),
+         State("pareto", "figure"),
+         State("categorias_torta", "figure")],
+        prevent_initial_call=True
+    )
+
+    # La tabla se pagina, ordena y filtra en el servidor: solo viajan las filas
+    # de la página visible.
+    @app.callback(
+        [Output("tabla-datos", "data"),
+         Output("tabla-datos", "page_count"),
+         Output("tabla-datos", "page_current")],
+        [Input("filtro-equipo", "value"),
+         Input("filtro-categoria", "value"),
+         Input("tabla-datos", "page_current"),
+         Input("tabla-datos", "page_size"),
+         Input("tabla-datos", "sort_by"),
+         Input("tabla-datos", "filter_query")]
+    )
+    def actualizar_tabla(equipo_seleccionado, categoria_seleccionada,
+                         page_current, page_size, sort_by, filter_query):
+        orden = tuple((col["column_id"], col["direction"]) for col in sort_by or [])
+        return pagina_tabla(equipo_seleccionado, categoria_seleccionada,
+                            page_current or 0, page_size, orden, filter_query or "")
+
+    @cache.memoize()
+    def pagina_tabla(equipo, categoria, page_current, page_size, orden, filter_query):
+        """Página de la tabla, cacheada por combinación de argumentos."""
+        return paginar_tabla(df, equipo, categoria, page_current, page_size, orden,
+                             filter_query, columnas)
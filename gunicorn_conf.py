@@ -0,0 +1,9 @@
+# Configuración de gunicorn para Render: gunicorn -c gunicorn_conf.py app:server
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8050')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+
+# El proceso padre importa app.py (y carga df) una sola vez; los workers se
+# crean con fork y comparten esas páginas de memoria mientras nadie las modifique
+preload_app = True
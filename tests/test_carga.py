@@ -0,0 +1,77 @@
+import pytest
+
+from dashboard import core
+
+
+@pytest.fixture
+def cargar(tmp_path, monkeypatch):
+    def cargar(contenido):
+        csv = tmp_path / "datos.csv"
+        csv.write_text(contenido, encoding="utf-8")
+        monkeypatch.setattr(core, "CSV", str(csv))
+        monkeypatch.setattr(core, "PARQUET", str(tmp_path / "datos.parquet"))
+        core.load_df.cache_clear()
+        return core.load_df()
+
+    yield cargar
+    core.load_df.cache_clear()
+
+
+def test_csv_irregular_sin_fecha(cargar):
+    df = cargar(
+        "Equipo,Falla,Causa,Categoria,Frecuencia\n"
+        "Bomba 1,Fuga,Sello,Causa Física,5\n"
+        "Bomba 2,Fuga,Sello,Causa Física,,EXTRA\n"
+    )
+    assert df["Fecha"].isna().all()
+    assert str(df["Fecha"].dtype) == "datetime64[ns]"
+    assert df["Frecuencia"].tolist() == [5, 0]
+
+
+def test_csv_irregular_con_valores_ilegibles(cargar):
+    df = cargar(
+        "Fecha,Equipo,Falla,Causa,Categoria,Frecuencia\n"
+        "2024-01-05,Bomba 1,Fuga,Sello,Causa Física,5\n"
+        "pendiente,Bomba 2,,Sello,Causa Física,x,EXTRA\n"
+    )
+    assert df["Fecha"].isna().tolist() == [False, True]
+    assert df["Falla"].tolist() == ["Fuga", "Sin datos"]
+    assert df["Frecuencia"].tolist() == [5, 0]
+    assert str(df["Frecuencia"].dtype) == "int32"
+
+
+def test_parquet_de_otra_version_se_regenera(cargar, tmp_path):
+    contenido = (
+        "Fecha,Equipo,Falla,Causa,Categoria,Frecuencia\n"
+        "2024-01-05,,Fuga,Sello,Causa Física,\n"
+    )
+    cargar(contenido)
+    # Parquet escrito sin marca de versión (como antes de los rellenos)
+    tabla = core.pq.read_table(core.PARQUET).replace_schema_metadata(None)
+    core.pq.write_table(tabla, core.PARQUET)
+    assert not core.parquet_vigente()
+
+    core.load_df.cache_clear()
+    df = core.load_df()
+    assert core.parquet_vigente()
+    assert df["Equipo"].tolist() == ["Sin datos"]
+
+
+def test_sin_permiso_de_escritura_usa_memoria(tmp_path, monkeypatch):
+    csv = tmp_path / "datos.csv"
+    csv.write_text(
+        "Fecha,Equipo,Falla,Causa,Categoria,Frecuencia\n"
+        "2024-01-05,Bomba 1,Fuga,Sello,Causa Física,5\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(core, "CSV", str(csv))
+    monkeypatch.setattr(core, "PARQUET", str(tmp_path / "no-existe" / "datos.parquet"))
+    core.load_df.cache_clear()
+    try:
+        df = core.load_df()
+    finally:
+        core.load_df.cache_clear()
+
+    assert df["Equipo"].tolist() == ["Bomba 1"]
+    assert str(df["Equipo"].dtype) == "category"
+    assert str(df["Frecuencia"].dtype) == "int32"
@@ -0,0 +1,84 @@
+import pandas as pd
+import pytest
+
+from dashboard.core import filtrar_tabla, paginar_tabla, separar_filtro
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "Fecha": pd.to_datetime(["2024-01-05", "2024-02-10", None]),
+        "Equipo": pd.Categorical(["Bomba 1", "Motor 2", "Bomba 12"]),
+        "Falla": pd.Categorical(["Fuga de aceite", "Alta vibración", ""]),
+        "Frecuencia": pd.array([5, 8, 15], dtype="int32"),
+    })
+
+
+@pytest.mark.parametrize("parte, esperado", [
+    ("{Frecuencia} ge 7", ("Frecuencia", "ge", 7.0)),
+    ("{Frecuencia} >= 7", ("Frecuencia", "ge", 7.0)),
+    ("{Equipo} contains 1", ("Equipo", "contains", "1")),
+    ('{Falla} contains "ge "', ("Falla", "contains", "ge ")),
+    ('{Equipo} eq "Bomba 1"', ("Equipo", "eq", "Bomba 1")),
+    ("{Falla} is blank", ("Falla", "is blank", "")),
+    ("sin columna", (None, None, None)),
+])
+def test_separar_filtro(parte, esperado):
+    assert separar_filtro(parte) == esperado
+
+
+@pytest.mark.parametrize("filter_query, equipos", [
+    ("", ["Bomba 1", "Motor 2", "Bomba 12"]),
+    ("{Equipo} contains 1", ["Bomba 1", "Bomba 12"]),
+    ("{Frecuencia} contains 5", ["Bomba 1", "Bomba 12"]),
+    ('{Falla} contains "ge "', []),
+    ('{Falla} contains "de "', ["Bomba 1"]),
+    ("{Frecuencia} gt 6 && {Equipo} contains Bomba", ["Bomba 12"]),
+    ('{Equipo} eq "Motor 2"', ["Motor 2"]),
+    ('{Fecha} datestartswith "2024-02"', ["Motor 2"]),
+    ("{Falla} is blank", ["Bomba 12"]),
+    ("{Frecuencia} gt abc", []),
+    ("{Frecuencia} is prime", []),
+])
+def test_filtrar_tabla(df, filter_query, equipos):
+    assert filtrar_tabla(df, filter_query)["Equipo"].tolist() == equipos
+
+
+@pytest.fixture
+def df_paginas():
+    # Categorías en orden de aparición, no alfabético
+    equipos = ["Motor 2", "Bomba 1", "Compresor 1", "Bomba 10", "Motor 1"]
+    return pd.DataFrame({
+        "Equipo": pd.Categorical(equipos, categories=equipos),
+        "Categoria": pd.Categorical(["Técnica", "Física", "Técnica", "Física", "Física"]),
+        "Frecuencia": pd.array([3, 5, 3, 1, 5], dtype="int32"),
+    })
+
+
+@pytest.mark.parametrize("equipo, categoria, page_current, filter_query, esperado", [
+    (None, None, 0, "", (2, 0)),
+    (None, None, 1, "", (2, 1)),
+    (None, None, 9, "", (2, 1)),
+    (None, "Física", 9, "", (1, 0)),
+    ("Motor 2", "Física", 3, "", (1, 0)),
+    (None, None, 0, "{Equipo} contains Turbina", (1, 0)),
+])
+def test_paginar_tabla_paginas(df_paginas, equipo, categoria, page_current,
+                               filter_query, esperado):
+    filas, page_count, pagina = paginar_tabla(
+        df_paginas, equipo, categoria, page_current, 3, (), filter_query)
+    assert (page_count, pagina) == esperado
+    assert len(filas) <= 3
+
+
+@pytest.mark.parametrize("orden, equipos", [
+    ((("Equipo", "asc"),),
+     ["Bomba 1", "Bomba 10", "Compresor 1", "Motor 1", "Motor 2"]),
+    ((("Equipo", "desc"),),
+     ["Motor 2", "Motor 1", "Compresor 1", "Bomba 10", "Bomba 1"]),
+    ((("Frecuencia", "desc"), ("Equipo", "asc")),
+     ["Bomba 1", "Motor 1", "Compresor 1", "Motor 2", "Bomba 10"]),
+])
+def test_paginar_tabla_orden(df_paginas, orden, equipos):
+    filas, _, _ = paginar_tabla(df_paginas, None, None, 0, 10, orden, "")
+    assert [fila["Equipo"] for fila in filas] == equipos